@@ -1,14 +1,35 @@
 """Backend light control: serial COMs, modes, and beat-synced fades."""
 from __future__ import annotations
 
+import logging
+import os
+import queue
+import selectors
+import sys
 import threading
 import time
+from collections import Counter, deque
 from enum import Enum
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Final, NamedTuple, Optional, Tuple, Union
 
-import serial
+if TYPE_CHECKING:
+    import serial  # imported lazily at runtime; see _ensure_serial()
 
 RgbTuple = Tuple[int, int, int]
+# Writer-thread control message, e.g. ("port", "COM3").
+TxControl = Tuple[str, Optional[str]]
+TxItem = Union[bytes, TxControl, None]
+
+_logger = logging.getLogger(__name__)
+
+# ASCII digits for every channel value, so RGB frames can be assembled from bytes directly.
+_B256: Final[tuple[bytes, ...]] = tuple(str(i).encode("ascii") for i in range(256))
+_SP: Final = b" "
+
+
+def clamp_u8(value: float) -> int:
+    """Saturate a channel value to 0..255 without min()/max() builtin calls."""
+    return 0 if value < 0 else 255 if value > 255 else int(value)
 
 
 class LightMode(Enum):
@@ -21,22 +42,164 @@ class LightMode(Enum):
     FADE_SYNC_EVERY_4 = "fade_sync_every_4"
 
 
+class _FrameQueue:
+    """Bounded FIFO of encoded frames and control messages for the writer thread.
+
+    When full, the oldest queued RGB frame is dropped to make room ("latest
+    wins"). If no RGB frame is queued, an incoming RGB frame is dropped instead.
+    OFF frames, control messages and the ``None`` stop sentinel are never
+    discarded and are always accepted, so ``maxsize`` only bounds RGB traffic.
+    """
+
+    __slots__ = ("_items", "_maxsize", "_cond")
+
+    def __init__(self, maxsize: int) -> None:
+        self._items: deque[TxItem] = deque()
+        self._maxsize = maxsize
+        self._cond = threading.Condition(threading.Lock())
+
+    def put(self, item: TxItem) -> None:
+        with self._cond:
+            if isinstance(item, bytes) and len(self._items) >= self._maxsize:
+                if not self._drop_oldest_rgb() and item.startswith(b"RGB"):
+                    return  # Nothing evictable; the new RGB frame is the one to lose.
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> TxItem:
+        """Pop the next item, raising ``queue.Empty`` if none arrives within ``timeout``."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            return self._items.popleft()
+
+    def _drop_oldest_rgb(self) -> bool:
+        items = self._items
+        for idx, frame in enumerate(items):
+            if isinstance(frame, bytes) and frame.startswith(b"RGB"):
+                del items[idx]
+                return True
+        return False
+
+
+class _ThreadSampler:
+    """Opt-in wall-clock sampling profiler (``LIGHTCTRL_PROFILE=1``).
+
+    Periodically records where every thread is, including threads blocked in
+    sleeps, locks or IO, and logs the hottest locations per thread name on stop.
+    """
+
+    __slots__ = ("_interval", "_samples", "_stop", "_thread")
+
+    def __init__(self, interval_sec: float = 0.005) -> None:
+        self._interval = interval_sec
+        self._samples: dict[str, Counter[str]] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="light-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop_and_report(self, top: int = 5) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        for thread_name, counts in sorted(self._samples.items()):
+            total = sum(counts.values())
+            _logger.info("profile %s: %d samples", thread_name, total)
+            for location, hits in counts.most_common(top):
+                _logger.info("  %5.1f%%  %s", 100.0 * hits / total, location)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self._interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_id:
+                    continue
+                location = self._describe(frame)
+                # Attribute library waits (queue/lock/select) to the controller code that called them.
+                caller = frame.f_back
+                while caller is not None and caller.f_code.co_filename != __file__:
+                    caller = caller.f_back
+                if caller is not None and caller is not frame:
+                    location = f"{location} <- {self._describe(caller)}"
+                name = names.get(ident, str(ident))
+                self._samples.setdefault(name, Counter())[location] += 1
+
+    @staticmethod
+    def _describe(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class _ControllerState(NamedTuple):
+    """Read-mostly settings, published as one immutable snapshot."""
+
+    mode: LightMode
+    color: RgbTuple
+    fade_out_ms: int
+    com_port: Optional[str]
+
+
 class LightController:
     """Handle serial LED commands and beat-synced fading (new on-device fade protocol)."""
 
-    def __init__(self, baudrate: int = 115200) -> None:
+    # No per-instance __dict__: fixed slots keep the beat/worker attribute loads cheap.
+    __slots__ = (
+        "on_error",
+        "_baudrate",
+        "_serial",
+        "_tx_port",
+        "_state",
+        "_lock",
+        "_last_beat_mono",
+        "_beat_counter",
+        "_cycle_index",
+        "_worker_thread",
+        "_worker_cv",
+        "_worker_epoch",
+        "_cycle_colors",
+        "_cycle_interval_sec",
+        "_cycle_fade_in_ms",
+        "_cycle_fade_out_ms",
+        "_slider_fade_interval_sec",
+        "_slider_fade_duration_ms",
+        "_rgb_cmd_cache",
+        "_rgb_cmd_cache_size",
+        "_auto_rgb_frames",
+        "_beat_step_frames",
+        "_tx_queue",
+        "_coalesce_ms",
+        "_tx_selector",
+        "_tx_selector_owner",
+        "_timeout_exc",
+        "_tx_thread",
+        "_log_queue",
+        "_log_thread",
+        "_profiler",
+    )
+
+    def __init__(
+        self, baudrate: int = 115200, on_error: Optional[Callable[[Exception], None]] = None
+    ) -> None:
+        # Called on the writer thread with each port-open or write failure, since those
+        # happen after the queuing call has already returned to its caller.
+        self.on_error = on_error
         self._baudrate = baudrate
-        self._com_port: Optional[str] = None
+        # Owned by the writer thread; other threads reconfigure it via TxControl messages.
         self._serial: Optional[serial.Serial] = None
-        self._mode: LightMode = LightMode.OFF
-        self._color: RgbTuple = (0, 0, 0)
+        self._tx_port: Optional[str] = None
+        # Readers unpack this without locking (reference assignment is atomic);
+        # writers build a replacement under self._lock.
+        self._state = _ControllerState(LightMode.OFF, (0, 0, 0), 1000, None)
         self._lock = threading.Lock()
-        self._last_beat_send_ts: Optional[float] = None
-        self._fade_out_ms: int = 1000
+        self._last_beat_mono: float = float("-inf")  # monotonic time of the last beat frame
         self._beat_counter: int = 0
         self._cycle_index: int = 0
         self._worker_thread: Optional[threading.Thread] = None
-        self._worker_stop = threading.Event()
+        # Wakes the mode worker when it is stopped; guards _worker_epoch.
+        self._worker_cv = threading.Condition(threading.Lock())
+        self._worker_epoch: int = 0  # bumped on every stop so stale workers go quiet
         # Tunables for the new modes
         self._cycle_colors: tuple[RgbTuple, ...] = (
             (255, 0, 0),
@@ -48,43 +211,67 @@ class LightController:
         self._cycle_fade_out_ms: int = 800
         self._slider_fade_interval_sec: float = 2.5
         self._slider_fade_duration_ms: int = 1200
+        # Encoded RGB commands keyed by (r, g, b, fade_in, fade_out); oldest evicted first.
+        self._rgb_cmd_cache: dict[tuple[int, int, int, int, int], bytes] = {}
+        self._rgb_cmd_cache_size: int = 256
+        # Pre-encoded frames for the color-cycling modes, indexed by _cycle_index.
+        self._auto_rgb_frames: tuple[bytes, ...] = ()
+        self._beat_step_frames: tuple[bytes, ...] = ()
+        self._rebuild_cycle_frames()
+        # Serial writes happen on a dedicated thread so callers never block on IO.
+        self._tx_queue = _FrameQueue(maxsize=8)
+        self._coalesce_ms: int = 5  # window for merging bursts of frames
+        # POSIX only: writability selector for the current port (writer thread only).
+        self._tx_selector: Optional[selectors.BaseSelector] = None
+        self._tx_selector_owner: Optional[serial.Serial] = None
+        # serial.SerialTimeoutException, bound by _ensure_serial() once pyserial is loaded;
+        # the write paths only run after that, so the placeholder is never raised or caught.
+        self._timeout_exc: type[Exception] = TimeoutError
+        self._tx_thread = threading.Thread(target=self._tx_loop, name="light-tx", daemon=True)
+        self._tx_thread.start()
+        # Enabled log records are formatted and emitted off the hot path by a separate thread.
+        self._log_queue: "queue.SimpleQueue[Optional[tuple[int, str, tuple]]]" = queue.SimpleQueue()
+        self._log_thread = threading.Thread(target=self._log_loop, name="light-log", daemon=True)
+        self._log_thread.start()
+        self._profiler: Optional[_ThreadSampler] = None
+        if os.environ.get("LIGHTCTRL_PROFILE") == "1":
+            self._profiler = _ThreadSampler()
+            self._profiler.start()
 
     # ------------------------------ lifecycle ------------------------------ #
     def close(self) -> None:
         """Stop background work and release serial resources."""
         self._stop_worker()
-        self._close_serial()
+        self._stop_writer()
+        self._stop_logger()
+        if self._profiler is not None:
+            self._profiler.stop_and_report()
+            self._profiler = None
 
     def set_com_port(self, com_port: str) -> None:
         """Update COM port target; closes any existing connection."""
         if not com_port:
             raise ValueError("COM port is required")
 
-        old_serial: Optional[serial.Serial] = None
         with self._lock:
-            if com_port == self._com_port and self._serial and self._serial.is_open:
+            if com_port == self._state.com_port:
                 return
-            old_serial = self._serial
-            self._serial = None
-            self._com_port = com_port
-        if old_serial:
-            try:
-                old_serial.close()
-            except Exception:
-                pass
+            self._state = self._state._replace(com_port=com_port)
+        # The writer thread owns the handle; it closes the old port before any later frame.
+        self._tx_queue.put(("port", com_port))
 
     # ------------------------------- commands ------------------------------ #
     def set_mode(self, mode: LightMode) -> None:
         self._stop_worker()
         with self._lock:
-            self._mode = mode
+            self._state = state = self._state._replace(mode=mode)
             self._beat_counter = 0
             self._cycle_index = 0
-            self._last_beat_send_ts = None
+            self._last_beat_mono = float("-inf")
         if mode == LightMode.OFF:
             self._send_off()
         elif mode == LightMode.ON:
-            self._send_rgb(self._color, fade_in=0, fade_out=0)
+            self._send_rgb(state.color, fade_in=0, fade_out=0)
         elif mode == LightMode.FADE_SYNC:
             # No immediate action; beat pulses will trigger fades.
             pass
@@ -95,18 +282,18 @@ class LightController:
             pass
 
     def set_color(self, rgb: RgbTuple) -> None:
-        clamped = tuple(max(0, min(int(v), 255)) for v in rgb)
+        r, g, b = rgb
+        clamped = (clamp_u8(r), clamp_u8(g), clamp_u8(b))
+        if clamped == self._state.color:
+            return
         with self._lock:
-            self._color = clamped  # type: ignore[assignment]
-            mode = self._mode
-        if mode == LightMode.ON:
+            self._state = state = self._state._replace(color=clamped)
+        if state.mode == LightMode.ON:
             self._send_rgb(clamped, fade_in=0, fade_out=0)
 
     def send_static_color(self) -> None:
         """Force-send the current color to the lamp."""
-        with self._lock:
-            rgb = self._color
-        self._send_rgb(rgb, fade_in=0, fade_out=0)
+        self._send_rgb(self._state.color, fade_in=0, fade_out=0)
 
     def set_decay_seconds(self, seconds: float) -> None:
         """Update decay duration (seconds UI) used for beat-triggered fades (stored as ms)."""
@@ -114,155 +301,326 @@ class LightController:
 
     def set_decay_ms(self, milliseconds: float) -> None:
         """Update decay duration in milliseconds for beat-triggered fades."""
+        ms = max(0.0, min(float(milliseconds), 10000.0))
         with self._lock:
-            ms = max(0.0, min(float(milliseconds), 10000.0))
-            self._fade_out_ms = int(ms)
+            self._state = self._state._replace(fade_out_ms=int(ms))
+        self._rebuild_cycle_frames()
 
     # ------------------------------- beat sync ----------------------------- #
     def handle_beat(self, bpm_hint: Optional[float]) -> None:
         """Kick off a fade cycle aligned with an incoming beat."""
-        now = time.time()
-        # Some controllers emit duplicate beat notes; drop any within 100 ms.
-        if self._last_beat_send_ts and (now - self._last_beat_send_ts) < 0.2:
-            print(f"[light_controller {self._ts()}] beat suppressed (duplicate within 200ms)")
-            return
-        with self._lock:
-            mode = self._mode
-            color = self._color
-            fade_out_ms = max(0, self._fade_out_ms)
-
-        if mode == LightMode.FADE_SYNC:
-            # Use user-configured decay; ignore BPM for decay timing. Units: ms.
-            fade_in_ms = 0  # pop on the beat
-            self._send_rgb(color, fade_in=fade_in_ms, fade_out=fade_out_ms)
-            self._last_beat_send_ts = now
+        now = time.monotonic()
+        # Some controllers emit duplicate beat notes; drop any within 200 ms.
+        if now - self._last_beat_mono < 0.2:
+            self._log(logging.DEBUG, "beat suppressed (duplicate within 200ms)")
             return
-
+        mode, color, fade_out_ms, _ = self._state
         if mode == LightMode.BEAT_RGB_STEP:
-            color = self._next_cycle_color()
-            self._send_rgb(color, fade_in=0, fade_out=fade_out_ms)
-            self._last_beat_send_ts = now
-            return
-
-        if mode == LightMode.FADE_SYNC_EVERY_4:
+            frame = self._beat_step_frames[self._next_cycle_index()]
+        elif mode == LightMode.FADE_SYNC:
+            # Use user-configured decay; ignore BPM for decay timing. Pop on the beat.
+            frame = self._encode_rgb(color, 0, fade_out_ms)
+        elif mode == LightMode.FADE_SYNC_EVERY_4:
             with self._lock:
                 self._beat_counter = (self._beat_counter + 1) % 4
-                beat_index = self._beat_counter
-            if beat_index != 0:
-                return
-            self._send_rgb(color, fade_in=0, fade_out=fade_out_ms)
-            self._last_beat_send_ts = now
+                if self._beat_counter != 0:
+                    return
+            frame = self._encode_rgb(color, 0, fade_out_ms)
+        else:
             return
+        self._last_beat_mono = now
+        self._write_line(frame)
 
     # ------------------------------- workers ------------------------------- #
     def _start_worker(self, mode: LightMode) -> None:
-        self._worker_stop = threading.Event()
         self._worker_thread = threading.Thread(
-            target=self._worker_loop, args=(mode, self._worker_stop), daemon=True
+            target=self._worker_loop,
+            args=(mode, self._worker_epoch),
+            name=f"light-worker-{mode.value}",
+            daemon=True,
         )
         self._worker_thread.start()
 
     def _stop_worker(self) -> None:
-        self._worker_stop.set()
-        thread = self._worker_thread
-        if thread and thread.is_alive():
-            thread.join(timeout=0.5)
+        # Don't join: bump the epoch and let the old worker exit on its own. Workers check
+        # the epoch and queue their frame under this same lock, so once this returns a
+        # superseded worker cannot queue anything behind the next mode's frames.
+        with self._worker_cv:
+            self._worker_epoch += 1
+            self._worker_cv.notify_all()
         self._worker_thread = None
 
-    def _worker_loop(self, mode: LightMode, stop_event: threading.Event) -> None:
-        while not stop_event.is_set():
+    def _worker_period(self, mode: LightMode) -> float:
+        if mode == LightMode.AUTO_RGB_FADE:
+            fade_ms = self._cycle_fade_in_ms + self._cycle_fade_out_ms
+            return max(self._cycle_interval_sec, fade_ms / 1000.0)
+        return max(self._slider_fade_interval_sec, 2 * self._slider_fade_duration_ms / 1000.0)
+
+    def _worker_loop(self, mode: LightMode, epoch: int) -> None:
+        if mode not in (LightMode.AUTO_RGB_FADE, LightMode.SLIDER_SLOW_FADE):
+            return
+        cv = self._worker_cv
+        # Schedule against absolute deadlines so send time does not stretch the period.
+        next_deadline = time.monotonic()
+        while epoch == self._worker_epoch:
+            retry_after: Optional[float] = None
             try:
-                if mode == LightMode.AUTO_RGB_FADE:
-                    color = self._next_cycle_color()
-                    fade_in = self._cycle_fade_in_ms
-                    fade_out = self._cycle_fade_out_ms
-                    wait_for = max(self._cycle_interval_sec, (fade_in + fade_out) / 1000.0)
-                    self._send_rgb(color, fade_in=fade_in, fade_out=fade_out)
-                elif mode == LightMode.SLIDER_SLOW_FADE:
-                    with self._lock:
-                        color = self._color
-                    fade_in = fade_out = self._slider_fade_duration_ms
-                    wait_for = max(self._slider_fade_interval_sec, (fade_in + fade_out) / 1000.0)
-                    self._send_rgb(color, fade_in=fade_in, fade_out=fade_out)
-                else:
+                if not self._worker_write(mode, epoch):
                     return
             except Exception as exc:  # pragma: no cover - defensive runtime log
-                print(f"[light_controller {self._ts()}] worker error in {mode.value}: {exc}")
-                wait_for = 1.0
-            stop_event.wait(wait_for)
-
-    def _next_cycle_color(self) -> RgbTuple:
+                self._log(logging.WARNING, "worker error in %s: %s", mode.value, exc)
+                retry_after = 1.0
+            period = retry_after or self._worker_period(mode)
+            remaining = next_deadline + period - time.monotonic()
+            with cv:
+                # Only _stop_worker notifies, so a wakeup before the deadline means stop.
+                if cv.wait_for(lambda: epoch != self._worker_epoch, max(0.0, remaining)):
+                    return
+            next_deadline += period
+            if time.monotonic() - next_deadline > 2 * period:
+                # Fell far behind (e.g. system sleep); resync instead of bursting to catch up.
+                next_deadline = time.monotonic()
+
+    def _worker_write(self, mode: LightMode, epoch: int) -> bool:
+        """Queue the worker's next frame; False if the worker has been superseded."""
+        with self._worker_cv:
+            if epoch != self._worker_epoch:
+                # Checked before advancing the cycle so a stale worker can't shift the
+                # next cycle's starting color.
+                return False
+            if mode == LightMode.AUTO_RGB_FADE:
+                frame = self._auto_rgb_frames[self._next_cycle_index()]
+            else:
+                fade = self._slider_fade_duration_ms
+                frame = self._encode_rgb(self._state.color, fade, fade)
+            self._write_line(frame)
+        return True
+
+    def _next_cycle_index(self) -> int:
         with self._lock:
             idx = self._cycle_index
-            self._cycle_index = (self._cycle_index + 1) % len(self._cycle_colors)
-            return self._cycle_colors[idx]
+            self._cycle_index = (idx + 1) % len(self._cycle_colors)
+        return idx
+
+    def _rebuild_cycle_frames(self) -> None:
+        """Re-encode the cycle-mode frames after colors or fade timings change."""
+        decay = self._state.fade_out_ms
+        self._auto_rgb_frames = tuple(
+            self._encode_rgb(c, self._cycle_fade_in_ms, self._cycle_fade_out_ms)
+            for c in self._cycle_colors
+        )
+        self._beat_step_frames = tuple(self._encode_rgb(c, 0, decay) for c in self._cycle_colors)
 
     # ------------------------------- transport ----------------------------- #
     def _ensure_serial(self) -> serial.Serial:
-        with self._lock:
-            ser = self._serial
-            port = self._com_port
+        """Return the open port, opening it on demand. Writer thread only."""
+        ser = self._serial
         if ser and ser.is_open:
             return ser
+        port = self._tx_port
         if not port:
             raise RuntimeError("Select a COM port first.")
 
+        # Deferred so merely constructing a controller doesn't load pyserial's backends.
+        import serial
+
+        self._timeout_exc = serial.SerialTimeoutException
         ser = serial.Serial(port, self._baudrate, timeout=1, write_timeout=0.05)
         try:
             ser.dtr = False  # avoid resets on some boards
         except Exception:
             pass
-
-        with self._lock:
-            self._serial = ser
+        if os.name == "posix" and getattr(ser, "fd", None) is not None:
+            os.set_blocking(ser.fd, False)
+        self._serial = ser
         return ser
 
     def _send_rgb(self, rgb: RgbTuple, fade_in: int, fade_out: int) -> None:
-        r, g, b = (max(0, min(int(v), 255)) for v in rgb)
+        self._write_line(self._encode_rgb(rgb, fade_in, fade_out))
+
+    def _encode_rgb(self, rgb: RgbTuple, fade_in: int, fade_out: int) -> bytes:
+        # Same saturation as clamp_u8(), inlined on the per-frame path.
+        r, g, b = rgb
+        r = 0 if r < 0 else 255 if r > 255 else int(r)
+        g = 0 if g < 0 else 255 if g > 255 else int(g)
+        b = 0 if b < 0 else 255 if b > 255 else int(b)
         fade_in = max(0, int(fade_in))
         fade_out = max(0, int(fade_out))
-        cmd = f"RGB {int(r)} {int(g)} {int(b)} {fade_in} {fade_out}\n".encode("ascii")
-        self._write_line(cmd)
+        key = (r, g, b, fade_in, fade_out)
+        cmd = self._rgb_cmd_cache.get(key)
+        if cmd is None:
+            cmd = b"".join((
+                b"RGB ", _B256[r], _SP, _B256[g], _SP, _B256[b], _SP,
+                str(fade_in).encode("ascii"), _SP, str(fade_out).encode("ascii"), b"\n",
+            ))
+            cache = self._rgb_cmd_cache
+            if len(cache) >= self._rgb_cmd_cache_size:
+                cache.pop(next(iter(cache)))
+            cache[key] = cmd
+        return cmd
 
     def _send_off(self) -> None:
         self._write_line(b"OFF\n")
 
     def _write_line(self, data: bytes) -> None:
+        """Queue a command for the writer thread and return immediately."""
+        # A plain attribute read is atomic; no need to take the lock just to check it.
+        if not self._state.com_port:
+            raise RuntimeError("Select a COM port first.")
+        self._tx_queue.put(data)
+
+    def _tx_loop(self) -> None:
+        pending: list[TxItem] = []
+        while True:
+            item = pending.pop() if pending else self._tx_queue.get()
+            if item is None:
+                break
+            if isinstance(item, tuple):
+                self._apply_tx_control(item)
+                continue
+            frames = self._coalesce_frames(item, pending)
+            try:
+                self._transmit(frames)
+            except Exception as exc:  # pragma: no cover - defensive runtime log
+                self._log(logging.WARNING, "serial write failed: %s", exc)
+                self._report_error(exc)
+        self._close_serial()
+
+    def _report_error(self, exc: Exception) -> None:
+        callback = self.on_error
+        if callback is None:
+            return
+        try:
+            callback(exc)
+        except Exception as cb_exc:  # pragma: no cover - never let a callback kill the writer
+            self._log(logging.WARNING, "error callback failed: %s", cb_exc)
+
+    def _coalesce_frames(self, first: bytes, pending: list[TxItem]) -> list[bytes]:
+        """Merge ``first`` with frames already queued behind it.
+
+        A lone frame is returned at once. Only when a backlog exists (a burst is
+        in progress) does the writer wait up to the coalesce window for its tail.
+        Only the newest frame of each command class (RGB vs OFF) survives, in the
+        order they were last queued. A control message or the stop sentinel ends
+        the batch early and is left in ``pending`` for the caller.
+        """
+        latest: dict[int, bytes] = {first[0]: first}
+        deadline = time.monotonic() + self._coalesce_ms / 1000.0
+        backlog = False
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if backlog else 0.0
+            try:
+                nxt = self._tx_queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if not isinstance(nxt, bytes):
+                pending.append(nxt)
+                break
+            backlog = True
+            # Re-insert so dict order tracks the most recent occurrence of each class.
+            latest.pop(nxt[0], None)
+            latest[nxt[0]] = nxt
+        return list(latest.values())
+
+    def _apply_tx_control(self, control: TxControl) -> None:
+        command, arg = control
+        if command == "port" and arg != self._tx_port:
+            self._close_serial()
+            self._tx_port = arg
+
+    def _transmit(self, frames: list[bytes]) -> None:
+        """Write a drained batch of frames with a single ``write()`` call."""
+        data = frames[0] if len(frames) == 1 else b"".join(frames)
         ser = self._ensure_serial()
+        if os.name == "posix" and getattr(ser, "fd", None) is not None:
+            self._write_nonblocking(ser, data)
+        else:
+            self._write_blocking(ser, data)
+        for frame in frames:
+            self._log_send(frame)
+
+    def _write_nonblocking(self, ser: serial.Serial, data: bytes) -> None:
+        """Write straight to the non-blocking fd, waiting on a selector when the driver is full."""
+        if self._tx_selector_owner is not ser:
+            if self._tx_selector is not None:
+                self._tx_selector.close()
+            self._tx_selector = selectors.DefaultSelector()
+            self._tx_selector.register(ser.fd, selectors.EVENT_WRITE)
+            self._tx_selector_owner = ser
+        selector = self._tx_selector
+        assert selector is not None
+        pending = memoryview(data)
+        timeout = ser.write_timeout or 0.05
+        purged = False
+        deadline = time.monotonic() + timeout
+        while pending:
+            try:
+                pending = pending[os.write(ser.fd, pending):]
+            except BlockingIOError:
+                pass
+            if not pending:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining > 0 and selector.select(remaining):
+                continue
+            if purged:
+                raise self._timeout_exc("Write timeout")
+            # Stalled: drop whatever stale bytes the driver still holds and try once more.
+            # The purge may discard the head of this batch too, so resend it from the start.
+            ser.reset_output_buffer()
+            pending = memoryview(data)
+            purged = True
+            deadline = time.monotonic() + timeout
+
+    def _write_blocking(self, ser: serial.Serial, data: bytes) -> None:
+        # Backpressure comes from the bounded frame queue; just pace on the driver.
         try:
-            if getattr(ser, "out_waiting", 0) > 256:
-                ser.reset_output_buffer()
             ser.write(data)
-            self._log_send(data)
-        except serial.SerialTimeoutException:
+        except self._timeout_exc:
             ser.reset_output_buffer()
             ser.write(data)
-            self._log_send(data)
-        # Small yield to avoid hammering the driver if beats come very quickly.
-        time.sleep(0.002)
+
+    def _stop_writer(self) -> None:
+        self._tx_queue.put(None)
+        thread = self._tx_thread
+        if thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=0.5)
 
     def _log_send(self, data: bytes) -> None:
         """Log each serial command as it is sent."""
-        try:
-            line = data.decode("ascii", errors="ignore").strip()
-        except Exception:
-            line = repr(data)
-        print(f"[light_controller {self._ts()}] sent: {line}")
+        if _logger.isEnabledFor(logging.DEBUG):
+            self._log_queue.put((logging.DEBUG, "sent: %s", (data,)))
 
-    def _ts(self) -> str:
-        return time.strftime("%H:%M:%S", time.localtime())
+    def _log(self, level: int, msg: str, *args: object) -> None:
+        if _logger.isEnabledFor(level):
+            self._log_queue.put((level, msg, args))
 
-    def _clear_output_buffer(self) -> None:
-        try:
-            ser = self._ensure_serial()
-            ser.reset_output_buffer()
-        except Exception:
-            pass
+    def _log_loop(self) -> None:
+        while True:
+            entry = self._log_queue.get()
+            if entry is None:
+                return
+            level, msg, args = entry
+            args = tuple(
+                a.decode("ascii", errors="ignore").strip() if isinstance(a, bytes) else a
+                for a in args
+            )
+            _logger.log(level, msg, *args)
+
+    def _stop_logger(self) -> None:
+        self._log_queue.put(None)
+        thread = self._log_thread
+        if thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=0.5)
 
     def _close_serial(self) -> None:
-        with self._lock:
-            ser = self._serial
-            self._serial = None
+        """Close the port and its selector. Writer thread only."""
+        if self._tx_selector is not None:
+            self._tx_selector.close()
+            self._tx_selector = None
+            self._tx_selector_owner = None
+        ser = self._serial
+        self._serial = None
         if ser and ser.is_open:
             try:
                 ser.close()
@@ -3,11 +3,12 @@
 It lets you pick a MIDI input port and a serial COM port, then shows the
 incoming beat/BPM information decoded by mixxx_listener.MixxxLightDecoder.
 """
+import logging
 import threading
 import time
 import tkinter as tk
 from tkinter import ttk
-from typing import Optional
+from typing import NamedTuple, Optional
 
 import mido
 import serial.tools.list_ports
@@ -16,24 +17,64 @@ import light_controller
 import mixxx_listener
 
 
+_logger = logging.getLogger(__name__)
+
+# How long the "beat incoming" indicator stays lit after the last beat.
+BEAT_HOLD_SEC = 1.0
+# Minimum spacing between color updates sent while a slider is dragged.
+COLOR_THROTTLE_MS = 20
+# Same for decay changes; each one re-encodes the cycle-mode frames.
+DECAY_THROTTLE_MS = 50
+# Notes that can change what the GUI shows; everything else (VU meters, ...) is ignored.
+_STATE_NOTES = frozenset(
+    (mixxx_listener.NOTE_DECK_CHANGE, mixxx_listener.NOTE_BEAT, mixxx_listener.NOTE_BPM)
+)
+
+
+class StateSnapshot(NamedTuple):
+    """Immutable view of decoder state, swapped in whole by the listener thread."""
+
+    reported_bpm: Optional[float] = None
+    calculated_bpm: Optional[float] = None
+    deck: Optional[int] = None
+    beat_time: Optional[float] = None  # time.monotonic() of the last beat
+
+
 class MixxxGUI:
     def __init__(self, root: tk.Tk) -> None:
         self.root = root
         self.root.title("Mixxx Light Visualizer")
 
         self.decoder = mixxx_listener.MixxxLightDecoder()
-        self.state_lock = threading.Lock()
-        self.state_snapshot = {}
-        self.last_beat_time: Optional[float] = None
+        # Replaced (never mutated) by the listener; reference assignment is atomic.
+        self.snapshot = StateSnapshot()
+        # Last options pushed to each label, so unchanged values skip the Tcl round-trip.
+        self._last_rendered: dict[str, dict] = {}
+        # Label updates queued for the next idle flush, keyed like _last_rendered.
+        self._pending_ui: dict[str, tuple[ttk.Label, dict]] = {}
+        self._flush_ui_id: Optional[str] = None
+        # Status labels are refreshed on demand: the listener posts a refresh when the
+        # snapshot changes, and a one-shot timer flips to "no beat" once beats stop.
+        self._refresh_posted = False
+        self._beat_expiry_id: Optional[str] = None
+        # Trailing-edge throttle for slider drags: only the latest color per window is sent.
+        self._pending_color: Optional[tuple[int, int, int]] = None
+        self._color_after_id: Optional[str] = None
+        self._pending_decay_ms: Optional[float] = None
+        self._decay_after_id: Optional[str] = None
         self.running = False
-        self.listen_thread: Optional[threading.Thread] = None
-        self.light_controller = light_controller.LightController()
+        # Open input whose callback runs on mido's backend thread while listening.
+        self._midi_port: Optional[mido.ports.BaseInput] = None
+        # (scan time, midi ports, com ports) from the last enumeration.
+        self._ports_cache: tuple[float, list[str], list[str]] = (float("-inf"), [], [])
+        self._scanning_ports = False
+        self.light_controller = light_controller.LightController(on_error=self._on_controller_error)
         self.mode_var = tk.StringVar(value=light_controller.LightMode.OFF.value)
         self.decay_var = tk.DoubleVar(value=1000.0)  # milliseconds
 
         self._build_ui()
         self.refresh_ports()
-        self._poll_ui()
+        self._refresh_status()
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def _build_ui(self) -> None:
@@ -59,7 +100,7 @@ class MixxxGUI:
         self.start_btn = ttk.Button(actions, text="Start listening", command=self.start_listening)
         self.start_btn.grid(row=0, column=0, sticky="w")
 
-        self.refresh_btn = ttk.Button(actions, text="Refresh ports", command=self.refresh_ports)
+        self.refresh_btn = ttk.Button(actions, text="Refresh ports", command=lambda: self.refresh_ports(force=True))
         self.refresh_btn.grid(row=0, column=1, sticky="e", padx=(8, 0))
 
         status_frame = ttk.LabelFrame(self.root, text="Mixxx state")
@@ -91,6 +132,8 @@ class MixxxGUI:
             "G": tk.IntVar(value=0),
             "B": tk.IntVar(value=0),
         }
+        # Plain-int mirror of rgb_vars so reading the color needs no Tcl getvar calls.
+        self._rgb = [0, 0, 0]
         self.rgb_value_labels: dict[str, ttk.Label] = {}
 
         for idx, color in enumerate(("R", "G", "B")):
@@ -159,24 +202,62 @@ class MixxxGUI:
             ttk.Label(preview_frame, text=f"{color}:").grid(row=0, column=idx * 2, sticky="e", padx=(0, 4))
             label = ttk.Label(preview_frame, text="0")
             label.grid(row=0, column=idx * 2 + 1, sticky="w")
-        self.rgb_value_labels[f"preview_{color}"] = label
+            self.rgb_value_labels[f"preview_{color}"] = label
+        # (render key, label) for the slider value and preview of each channel, resolved once.
+        self._rgb_label_slots: dict[str, tuple[tuple[str, ttk.Label], ...]] = {
+            color: (
+                (color, self.rgb_value_labels[color]),
+                (f"preview_{color}", self.rgb_value_labels[f"preview_{color}"]),
+            )
+            for color in ("R", "G", "B")
+        }
 
         self.status_var = tk.StringVar(value="Idle")
         self.status_label = ttk.Label(self.root, textvariable=self.status_var, anchor="w")
         self.status_label.grid(row=6, column=0, sticky="ew", **padding)
 
         # Initialize controller decay with slider value
-        self._on_decay_change(self.decay_var.get())
-
-    def refresh_ports(self) -> None:
-        midi_ports = ["<none>"] + mido.get_input_names()
-        com_ports = ["<none>"] + [p.device for p in serial.tools.list_ports.comports()]
+        self.light_controller.set_decay_ms(self.decay_var.get())
 
-        self.midi_combo["values"] = midi_ports
-        self.com_combo["values"] = com_ports
-
-        self.midi_combo.set("<none>")
-        self.com_combo.set("<none>")
+    def refresh_ports(self, force: bool = False) -> None:
+        if self._scanning_ports:
+            return
+        if not force and time.monotonic() - self._ports_cache[0] < 2.0:
+            return
+        # Enumeration can take hundreds of ms (WMI on Windows), so keep it off the UI thread.
+        self._scanning_ports = True
+        self.refresh_btn.config(text="Scanning...", state="disabled")
+        threading.Thread(target=self._scan_ports, name="port-scan", daemon=True).start()
+
+    def _scan_ports(self) -> None:
+        midi_ports: list[str] = ["<none>"]
+        com_ports: list[str] = ["<none>"]
+        try:
+            midi_ports += mido.get_input_names()
+        except Exception as exc:
+            _logger.warning("MIDI port scan failed: %s", exc)
+        try:
+            com_ports += [p.device for p in serial.tools.list_ports.comports()]
+        except Exception as exc:
+            _logger.warning("COM port scan failed: %s", exc)
+        try:
+            self.root.after(0, lambda: self._apply_ports(midi_ports, com_ports))
+        except (RuntimeError, tk.TclError):
+            pass  # Window closed while scanning.
+
+    def _apply_ports(self, midi_ports: list[str], com_ports: list[str]) -> None:
+        self._scanning_ports = False
+        self.refresh_btn.config(text="Refresh ports", state="normal")
+        _, cached_midi, cached_com = self._ports_cache
+        self._ports_cache = (time.monotonic(), midi_ports, com_ports)
+
+        # Only rebuild the dropdowns (and reset the selection) when the port set changed.
+        if midi_ports != cached_midi:
+            self.midi_combo["values"] = midi_ports
+            self.midi_combo.set("<none>")
+        if com_ports != cached_com:
+            self.com_combo["values"] = com_ports
+            self.com_combo.set("<none>")
 
     def start_listening(self) -> None:
         if self.running:
@@ -188,70 +269,98 @@ class MixxxGUI:
             self.set_status("Select a MIDI port first.")
             return
 
+        self.decoder.reset()
+        self.snapshot = StateSnapshot()
         self.running = True
-        self.decoder = mixxx_listener.MixxxLightDecoder()
-        self.last_beat_time = None
-        self.listen_thread = threading.Thread(target=self._listen_loop, args=(port_name,), daemon=True)
-        self.listen_thread.start()
+        try:
+            # mido's backend thread blocks on the device and calls us per message.
+            self._midi_port = mido.open_input(port_name, callback=self._on_midi_message)
+        except Exception as exc:
+            self.running = False
+            self.set_status(f"Error: {exc}")
+            return
         self.update_start_button()
         self.set_status(f"Listening on {port_name}")
 
     def stop_listening(self) -> None:
-        self.running = False
+        self._close_midi_port()
         self.update_start_button()
         self.set_status("Stopped")
 
-    def _listen_loop(self, port_name: str) -> None:
-        try:
-            with mido.open_input(port_name) as port:
-                while self.running:
-                    for msg in port.iter_pending():
-                        is_beat = msg.type == "note_on" and msg.note == mixxx_listener.NOTE_BEAT
-                        beat_bpm_hint: Optional[float] = None
-                        self.decoder.handle(msg)
-                        with self.state_lock:
-                            st = self.decoder.state
-                            self.state_snapshot = {
-                                "reported_bpm": st.reported_bpm,
-                                "calculated_bpm": st.calculated_bpm,
-                                "deck": st.current_deck,
-                            }
-                            if is_beat:
-                                self.last_beat_time = time.time()
-                                beat_bpm_hint = st.reported_bpm or st.calculated_bpm
-                        if is_beat:
-                            try:
-                                self.light_controller.handle_beat(beat_bpm_hint)
-                            except Exception as exc:
-                                self.root.after(0, lambda msg=f"Serial error: {exc}": self.set_status(msg))
-                    time.sleep(0.01)
-        except Exception as exc:
-            self.root.after(0, lambda: self.set_status(f"Error: {exc}"))
-        finally:
-            self.running = False
-            self.root.after(0, self.update_start_button)
-
-    def _poll_ui(self) -> None:
-        with self.state_lock:
-            snap = dict(self.state_snapshot)
-            beat_time = self.last_beat_time
-
-        
-
-        now = time.time()
-
-        if beat_time and (now - beat_time) < 1.00:
-            self.beat_indicator.config(text=f"beat incoming", foreground="green")
-            self.reported_bpm_label.config(self._fmt_value(snap.get("reported_bpm")))
-            self.calculated_bpm_label.config(self._fmt_value(snap.get("calculated_bpm")))
-            self.deck_label.config(text=str(snap.get("deck") or "--"))
+    def _close_midi_port(self) -> None:
+        self.running = False
+        port, self._midi_port = self._midi_port, None
+        if port is not None:
+            try:
+                port.close()
+            except Exception:
+                pass
+
+    def _on_midi_message(self, msg: mido.Message) -> None:
+        """Handle one MIDI message on mido's input thread."""
+        if not self.running or msg.type != "note_on" or msg.note not in _STATE_NOTES:
+            return
+        is_beat = msg.note == mixxx_listener.NOTE_BEAT
+        beat_bpm_hint: Optional[float] = None
+        self.decoder.handle(msg)
+        st = self.decoder.state
+        prev = self.snapshot
+        beat_time = prev.beat_time
+        if is_beat:
+            beat_time = time.monotonic()
+            beat_bpm_hint = st.reported_bpm or st.calculated_bpm
+        snap = StateSnapshot(st.reported_bpm, st.calculated_bpm, st.current_deck, beat_time)
+        if snap != prev:
+            self.snapshot = snap
+            if not self._refresh_posted:
+                self._refresh_posted = True
+                self.root.after(0, self._refresh_status)
+        if is_beat:
+            try:
+                self.light_controller.handle_beat(beat_bpm_hint)
+            except Exception as exc:
+                self.root.after(0, lambda msg=f"Serial error: {exc}": self.set_status(msg))
+
+    def _refresh_status(self) -> None:
+        self._refresh_posted = False
+        snap = self.snapshot
+        beat_time = snap.beat_time
+        now = time.monotonic()
+
+        if beat_time is not None and (now - beat_time) < BEAT_HOLD_SEC:
+            self._set_label("beat", self.beat_indicator, text="beat incoming", foreground="green")
+            self._set_label("reported_bpm", self.reported_bpm_label, **self._fmt_value(snap.reported_bpm))
+            self._set_label("calculated_bpm", self.calculated_bpm_label, **self._fmt_value(snap.calculated_bpm))
+            self._set_label("deck", self.deck_label, text=str(snap.deck or "--"))
+            # Come back once the hold expires to show "no beat" if nothing else arrives.
+            if self._beat_expiry_id is not None:
+                self.root.after_cancel(self._beat_expiry_id)
+            delay_ms = int((beat_time + BEAT_HOLD_SEC - now) * 1000) + 1
+            self._beat_expiry_id = self.root.after(delay_ms, self._on_beat_hold_elapsed)
         else:
-            self.beat_indicator.config(text="no beat", foreground="red")
-            self.reported_bpm_label.config(text="...", foreground="gray")
-            self.calculated_bpm_label.config(text="...", foreground="gray")
-            self.deck_label.config(text="...", foreground="gray")
+            self._set_label("beat", self.beat_indicator, text="no beat", foreground="red")
+            self._set_label("reported_bpm", self.reported_bpm_label, text="...", foreground="gray")
+            self._set_label("calculated_bpm", self.calculated_bpm_label, text="...", foreground="gray")
+            self._set_label("deck", self.deck_label, text="...", foreground="gray")
 
-        self.root.after(120, self._poll_ui)
+    def _on_beat_hold_elapsed(self) -> None:
+        self._beat_expiry_id = None
+        self._refresh_status()
+
+    def _set_label(self, key: str, widget: ttk.Label, **options) -> None:
+        if self._last_rendered.get(key) == options:
+            return
+        self._last_rendered[key] = options
+        self._pending_ui[key] = (widget, options)
+        if self._flush_ui_id is None:
+            self._flush_ui_id = self.root.after_idle(self._flush_ui)
+
+    def _flush_ui(self) -> None:
+        """Apply all queued label updates in one pass so Tk redraws once."""
+        self._flush_ui_id = None
+        pending, self._pending_ui = self._pending_ui, {}
+        for widget, options in pending.values():
+            widget.config(**options)
 
     def _fmt_value(self, value) -> dict:
         if value is None:
@@ -262,21 +371,19 @@ class MixxxGUI:
 
     def _on_slider_change(self, color: str, value: int) -> None:
         # Keep labels in sync for both side columns.
-        clamped = max(0, min(int(value), 255))
-        self.rgb_vars[color].set(clamped)
-        if color in self.rgb_value_labels:
-            self.rgb_value_labels[color].config(text=str(clamped))
-        preview_key = f"preview_{color}"
-        if preview_key in self.rgb_value_labels:
-            self.rgb_value_labels[preview_key].config(text=str(clamped))
+        clamped = light_controller.clamp_u8(value)
+        if clamped != value:
+            # The Scale already wrote in-range values to its variable; only fix strays.
+            self.rgb_vars[color].set(clamped)
+        self._rgb["RGB".index(color)] = clamped
+        text = str(clamped)
+        for key, label in self._rgb_label_slots[color]:
+            self._set_label(key, label, text=text)
         self._update_controller_color()
 
     def _get_rgb_tuple(self) -> tuple[int, int, int]:
-        return (
-            self.rgb_vars["R"].get(),
-            self.rgb_vars["G"].get(),
-            self.rgb_vars["B"].get(),
-        )
+        rgb = self._rgb
+        return (rgb[0], rgb[1], rgb[2])
 
     def _get_selected_com_port(self) -> Optional[str]:
         port = self.com_combo.get()
@@ -297,8 +404,17 @@ class MixxxGUI:
             return False
 
     def _update_controller_color(self) -> None:
+        self._pending_color = self._get_rgb_tuple()
+        if self._color_after_id is None:
+            self._color_after_id = self.root.after(COLOR_THROTTLE_MS, self._flush_color)
+
+    def _flush_color(self) -> None:
+        self._color_after_id = None
+        rgb, self._pending_color = self._pending_color, None
+        if rgb is None:
+            return
         try:
-            self.light_controller.set_color(self._get_rgb_tuple())
+            self.light_controller.set_color(rgb)
         except Exception as exc:
             if self.mode_var.get() == light_controller.LightMode.ON.value:
                 self.set_status(f"Serial error: {exc}")
@@ -338,8 +454,19 @@ class MixxxGUI:
 
     def _on_decay_change(self, value: float) -> None:
         val = max(0.0, min(float(value), 5000.0))
-        self.decay_var.set(val)
-        self.decay_label.config(text=f"{int(val)} ms")
+        if val != value:
+            # The Scale already wrote in-range values to its variable; only fix strays.
+            self.decay_var.set(val)
+        self._set_label("decay", self.decay_label, text=f"{int(val)} ms")
+        self._pending_decay_ms = val
+        if self._decay_after_id is None:
+            self._decay_after_id = self.root.after(DECAY_THROTTLE_MS, self._flush_decay)
+
+    def _flush_decay(self) -> None:
+        self._decay_after_id = None
+        val, self._pending_decay_ms = self._pending_decay_ms, None
+        if val is None:
+            return
         try:
             self.light_controller.set_decay_ms(val)
         except Exception as exc:
@@ -377,10 +504,28 @@ class MixxxGUI:
     def set_status(self, text: str) -> None:
         self.status_var.set(text)
 
+    def _on_controller_error(self, exc: Exception) -> None:
+        """Runs on the controller's writer thread; hop to Tk before touching widgets."""
+        try:
+            self.root.after(0, lambda: self._show_serial_error(exc))
+        except (RuntimeError, tk.TclError):
+            pass  # Window already closed.
+
+    def _show_serial_error(self, exc: Exception) -> None:
+        self.set_status(f"Serial error: {exc}")
+        if isinstance(exc, serial.SerialTimeoutException):
+            # The lamp is reachable, just slow; keep the current mode.
+            return
+        if self.mode_var.get() != light_controller.LightMode.OFF.value:
+            # Revert to off if we cannot talk to the lamp.
+            self.mode_var.set(light_controller.LightMode.OFF.value)
+            try:
+                self.light_controller.set_mode(light_controller.LightMode.OFF)
+            except Exception:
+                pass
+
     def on_close(self) -> None:
-        self.running = False
-        if self.listen_thread and self.listen_thread.is_alive():
-            self.listen_thread.join(timeout=1.0)
+        self._close_midi_port()
         try:
             self.light_controller.close()
         except Exception:
@@ -389,6 +534,14 @@ class MixxxGUI:
 
 
 def main() -> None:
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        mixxx_listener.SecondCachedFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s", "%H:%M:%S")
+    )
+    # Root stays at WARNING so the decoder's per-beat INFO lines don't add console IO on
+    # mido's callback thread; only the controller (which logs off its own thread) is chattier.
+    logging.basicConfig(level=logging.WARNING, handlers=[handler])
+    logging.getLogger(light_controller.__name__).setLevel(logging.INFO)
     root = tk.Tk()
     MixxxGUI(root)
     root.mainloop()
@@ -7,13 +7,18 @@ of deck changes, beats, BPM updates, and optional VU meters.
 """
 import argparse
 import logging
+import os
+import queue
 import sys
 import time
+from array import array
 from dataclasses import dataclass, field
 from typing import Optional
 
 import mido
 
+_logger = logging.getLogger(__name__)
+
 # Note numbers from the Mixxx "MIDI for light" mapping
 NOTE_DECK_CHANGE = 0x30  # 48
 NOTE_BEAT = 0x32         # 50
@@ -35,6 +40,9 @@ VU_NOTES = {
     0x4B: "vu_mono_average_meter3",
     0x4C: "vu_mono_average_meter4",
 }
+# The VU notes are contiguous, so levels are stored flat and indexed by note - VU_FIRST_NOTE.
+VU_FIRST_NOTE = min(VU_NOTES)
+VU_LABELS = tuple(VU_NOTES[note] for note in range(VU_FIRST_NOTE, VU_FIRST_NOTE + len(VU_NOTES)))
 
 
 @dataclass
@@ -43,9 +51,9 @@ class MixxxState:
 
     current_deck: Optional[int] = None
     reported_bpm: Optional[float] = None
-    last_beat_ts: Optional[float] = None
+    last_beat_ns: Optional[int] = None  # time.monotonic_ns() of the last accepted beat
     calculated_bpm: Optional[float] = None
-    vu_cache: dict = field(default_factory=dict)
+    vu_levels: array = field(default_factory=lambda: array("B", bytes(len(VU_LABELS))))
 
 
 class MixxxLightDecoder:
@@ -53,6 +61,17 @@ class MixxxLightDecoder:
 
     def __init__(self) -> None:
         self.state = MixxxState()
+        # note -> handler(velocity, channel), so handle() needs one dict lookup per message.
+        # Handlers get mido's 0-based channel; logs show it 1-based like the mapping docs.
+        self._dispatch = {
+            NOTE_DECK_CHANGE: self._handle_deck_change,
+            NOTE_BEAT: self._handle_beat,
+            NOTE_BPM: self._handle_bpm,
+        }
+
+    def reset(self) -> None:
+        """Forget all decoded state, e.g. before listening on a new port."""
+        self.state = MixxxState()
 
     def handle(self, msg: mido.Message, show_vu: bool = False) -> None:
         # The mapping uses note_on events for everything except MTC (not handled here).
@@ -60,38 +79,35 @@ class MixxxLightDecoder:
             return
 
         note = msg.note
-        velocity = msg.velocity
-        channel = msg.channel + 1  # mido is 0-based; mapping docs are 1-based
-
-        if note == NOTE_DECK_CHANGE:
-            self._handle_deck_change(velocity, channel)
-        elif note == NOTE_BEAT:
-            self._handle_beat(channel)
-        elif note == NOTE_BPM:
-            self._handle_bpm(velocity, channel)
-        elif show_vu and note in VU_NOTES:
-            self._handle_vu(note, velocity, channel)
+        handler = self._dispatch.get(note)
+        if handler is not None:
+            handler(msg.velocity, msg.channel)
+        elif show_vu and 0 <= note - VU_FIRST_NOTE < len(VU_LABELS):
+            self._handle_vu(note, msg.velocity, msg.channel)
 
     def _handle_deck_change(self, velocity: int, channel: int) -> None:
         # Velocity is 100 + deck number in the official script.
         deck = max(velocity - 100, 0) or None
         if deck:
             self.state.current_deck = deck
-            logging.info("Deck change -> deck %s (channel %s)", deck, channel)
-
-    def _handle_beat(self, channel: int) -> None:
-        now = time.time()
-        if self.state.last_beat_ts:
-            interval = now - self.state.last_beat_ts
+            _logger.info("Deck change -> deck %s (channel %s)", deck, channel + 1)
+
+    def _handle_beat(self, velocity: int, channel: int) -> None:
+        # Monotonic, so an NTP step or clock change cannot produce a bogus interval.
+        now = time.monotonic_ns()
+        last = self.state.last_beat_ns
+        if last is not None:
+            interval_ns = now - last
             # drop implausibly short intervals (< 0.2s => >300 BPM)
-            if interval < 0.2:
+            if interval_ns < 200_000_000:
                 return
-            self.state.calculated_bpm = 60.0 / interval
-        self.state.last_beat_ts = now
-        logging.info("Beat (deck=%s, calc_bpm=%s, reported_bpm=%s)",
-                    self.state.current_deck or "?",
-                    f"{self.state.calculated_bpm:.1f}" if self.state.calculated_bpm else "n/a",
-                    f"{self.state.reported_bpm:.1f}" if self.state.reported_bpm else "n/a")
+            self.state.calculated_bpm = 60_000_000_000 / interval_ns
+        self.state.last_beat_ns = now
+        if _logger.isEnabledFor(logging.INFO):
+            _logger.info("Beat (deck=%s, calc_bpm=%s, reported_bpm=%s)",
+                         self.state.current_deck or "?",
+                         f"{self.state.calculated_bpm:.1f}" if self.state.calculated_bpm else "n/a",
+                         f"{self.state.reported_bpm:.1f}" if self.state.reported_bpm else "n/a")
 
 
     def _handle_bpm(self, velocity: int, channel: int) -> None:
@@ -100,18 +116,65 @@ class MixxxLightDecoder:
         # No logging here; BPM is reported alongside the beat log to avoid double lines.
 
     def _handle_vu(self, note: int, velocity: int, channel: int) -> None:
-        label = VU_NOTES[note]
-        self.state.vu_cache[label] = velocity
-        logging.debug("VU %s = %d (channel %s)", label, velocity, channel)
+        idx = note - VU_FIRST_NOTE
+        self.state.vu_levels[idx] = velocity
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug("VU %s = %d (channel %s)", VU_LABELS[idx], velocity, channel + 1)
 
 
 def clamp_bpm_from_velocity(velocity: int) -> float:
     """Convert velocity back to BPM according to the mapping rules."""
     # In the script: send_value = clamp(BPM - 50, 0, 127)
     # This reverse assumes the original BPM was within the supported range.
+    if 0 <= velocity <= 127:
+        return _BPM_BY_VELOCITY[velocity]
     return float(max(0, min(velocity, 127)) + 50)
 
 
+# Every valid MIDI velocity (0..127) maps to a fixed BPM, so look it up instead of computing.
+_BPM_BY_VELOCITY = tuple(float(v + 50) for v in range(128))
+
+
+class SecondCachedFormatter(logging.Formatter):
+    """Formatter that runs strftime at most once per second for a whole-second datefmt."""
+
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None) -> None:
+        super().__init__(fmt, datefmt)
+        self._cached_time: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt is None:
+            # The default format appends milliseconds, so it cannot be shared per second.
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, text = self._cached_time
+        if second != cached_second:
+            text = super().formatTime(record, datefmt)
+            self._cached_time = (second, text)
+        return text
+
+
+def _raise_priority() -> None:
+    """Best-effort boost of the calling thread so beats are decoded promptly under load."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            kernel32 = ctypes.windll.kernel32
+            THREAD_PRIORITY_TIME_CRITICAL = 15
+            if not kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL):
+                raise ctypes.WinError()
+        elif hasattr(os, "sched_setscheduler"):
+            # pid 0 targets the calling thread on Linux; needs CAP_SYS_NICE or an rtprio limit.
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(50))
+        else:
+            return
+    except (OSError, AttributeError) as exc:
+        _logger.debug("Could not raise listener priority: %s", exc)
+    else:
+        _logger.debug("Raised listener thread priority")
+
+
 def list_input_ports() -> None:
     ports = mido.get_input_names()
     if not ports:
@@ -167,29 +230,36 @@ def main(argv: Optional[list[str]] = None) -> int:
         return 0
 
     level = logging.DEBUG if getattr(args, "debug", False) else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s %(levelname)s %(message)s",
-        datefmt="%H:%M:%S",
-    )
+    handler = logging.StreamHandler()
+    handler.setFormatter(SecondCachedFormatter("%(asctime)s %(levelname)s %(message)s", "%H:%M:%S"))
+    logging.basicConfig(level=level, handlers=[handler])
 
     port_name = getattr(args, "port", None) or guess_mixxx_port()
     if not port_name:
-        logging.error("No port specified and no Mixxx/light port found. Use --port.")
+        _logger.error("No port specified and no Mixxx/light port found. Use --port.")
         return 1
 
-    logging.info("Opening MIDI input: %s", port_name)
+    _logger.info("Opening MIDI input: %s", port_name)
     decoder = MixxxLightDecoder()
+    _raise_priority()
 
+    show_vu = getattr(args, "show_vu", False)
+    # mido's callback only enqueues; decoding and logging stay on this thread. The
+    # timed get keeps Ctrl+C responsive on Windows, where an untimed get() blocks it.
+    messages: "queue.SimpleQueue[mido.Message]" = queue.SimpleQueue()
     try:
-        with mido.open_input(port_name) as port:
-            logging.info("Listening... Ctrl+C to stop.")
-            for message in port:
-                decoder.handle(message, show_vu=getattr(args, "show_vu", False))
+        with mido.open_input(port_name, callback=messages.put):
+            _logger.info("Listening... Ctrl+C to stop.")
+            while True:
+                try:
+                    message = messages.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                decoder.handle(message, show_vu=show_vu)
     except KeyboardInterrupt:
-        logging.info("Stopped.")
+        _logger.info("Stopped.")
     except Exception as exc:  # pragma: no cover - defensive print for CLI
-        logging.error("Error while listening: %s", exc)
+        _logger.error("Error while listening: %s", exc)
         return 1
 
     return 0
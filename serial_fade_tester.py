@@ -18,6 +18,9 @@ BAUDRATE = 115200
 # Send every command once per second, regardless of fade length.
 SEND_INTERVAL_SEC = 1.0
 
+# A command line is ~25 bytes; more than this still queued means the lamp stopped reading.
+TX_HIGH_WATER = 64
+
 # (label, (r, g, b, fadeInMs, fadeOutMs))
 # Values are milliseconds for fade in/out.
 TEST_COMMANDS: Sequence[Tuple[str, Tuple[int, int, int, int, int]]] = (
@@ -32,16 +35,29 @@ TEST_COMMANDS: Sequence[Tuple[str, Tuple[int, int, int, int, int]]] = (
 
 
 def clamp_rgb(rgb: Iterable[int]) -> Tuple[int, int, int]:
-    values = tuple(max(0, min(int(v), 255)) for v in rgb)
-    return values  # type: ignore
+    r, g, b = rgb
+    return (
+        0 if r < 0 else 255 if r > 255 else int(r),
+        0 if g < 0 else 255 if g > 255 else int(g),
+        0 if b < 0 else 255 if b > 255 else int(b),
+    )
 
 
-def send_fade(ser: serial.Serial, r: int, g: int, b: int, fade_in: int, fade_out: int) -> None:
+def encode_fade(r: int, g: int, b: int, fade_in: int, fade_out: int) -> bytes:
     r, g, b = clamp_rgb((r, g, b))
     fade_in = max(0, int(fade_in))
     fade_out = max(0, int(fade_out))
-    cmd = f"RGB {r} {g} {b} {fade_in} {fade_out}\n".encode("ascii")
-    ser.write(cmd)
+    return f"RGB {r} {g} {b} {fade_in} {fade_out}\n".encode("ascii")
+
+
+def send_fade(ser: serial.Serial, r: int, g: int, b: int, fade_in: int, fade_out: int) -> None:
+    ser.write(encode_fade(r, g, b, fade_in, fade_out))
+
+
+# TEST_COMMANDS never change, so each command line is encoded once at import.
+ENCODED_COMMANDS: Sequence[Tuple[str, Tuple[int, int, int, int, int], bytes]] = tuple(
+    (label, params, encode_fade(*params)) for label, params in TEST_COMMANDS
+)
 
 
 def main() -> None:
@@ -51,27 +67,47 @@ def main() -> None:
             ser.dtr = False
         except Exception:
             pass
+        try:
+            # Linux only: have USB adapters (FTDI latency timer) hand ACKs over immediately.
+            ser.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, OSError, ValueError):
+            pass
+        # Short read timeout so ACK polling never delays the next command.
+        ser.timeout = 0.05
 
         print(f"Starting fade suite on {COM_PORT} @ {BAUDRATE}")
+        # Absolute send times, so write/read/print time does not accumulate as drift.
+        next_send = time.monotonic()
         while True:
-            for label, params in TEST_COMMANDS:
+            for label, params, payload in ENCODED_COMMANDS:
                 print(f"-> {label}: RGB {params}")
                 try:
-                    send_fade(ser, *params)
+                    # Drop stale commands up front rather than waiting out write_timeout.
+                    if ser.out_waiting > TX_HIGH_WATER:
+                        ser.reset_output_buffer()
+                except (OSError, serial.SerialException):
+                    pass  # Some drivers cannot report the TX queue depth.
+                try:
+                    ser.write(payload)
                 except serial.SerialTimeoutException:
                     ser.reset_output_buffer()
-                    send_fade(ser, *params)
+                    ser.write(payload)
 
                 # Read any immediate ACK/ERR without blocking the fade.
                 try:
-                    ser.timeout = 0.05
-                    line = ser.readline().decode("ascii", errors="ignore").strip()
+                    line = ser.readline().strip()
                     if line:
-                        print(f"   {line}")
+                        print(f"   {line.decode('ascii', errors='ignore')}")
                 except Exception:
                     pass
 
-                time.sleep(SEND_INTERVAL_SEC)
+                next_send += SEND_INTERVAL_SEC
+                remaining = next_send - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                else:
+                    # Fell behind (e.g. a write timeout); restart the cadence from now.
+                    next_send = time.monotonic()
 
             print("Cycle complete; restarting...\n")
 